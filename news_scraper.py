@@ -1,121 +1,416 @@
+import calendar
 import csv
+import logging
+import multiprocessing
+import os
+import shelve
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from requests_cache import CachedSession, EXPIRE_IMMEDIATELY
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from bs4.dammit import EncodingDetector, UnicodeDammit
+from lxml.cssselect import CSSSelector
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 import re
+from urllib.parse import urljoin, urlsplit
 
-def get_news_releases(companies_csv_path, days_within=7):
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 16 # 同時に取得するページ数
+HTTP_CACHE_NAME = "news_http_cache" # 条件付きGET用のHTTPキャッシュ (SQLite)
+MAX_BYTES = 2_000_000 # これより大きいページはダウンロードを打ち切ってスキップする
+NEGATIVE_CACHE_PATH = "negative_cache" # 403/404/SSLエラーになったURLを記録する shelve
+NEGATIVE_CACHE_TTL = timedelta(days=3) # この期間内に失敗したURLは再アクセスせずにスキップする
+# Add headers to mimic a browser visit
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+CSV_HEADER = ('company', 'title', 'url') # 出力CSVの列 (ニュースリリースの辞書のキーと同じ順)
+
+# 汎用セレクタ (仮のもの。実際のサイトに合わせて変更してください)
+# CSS→XPath の変換はインポート時に1度だけ行い、ページ・項目ごとには繰り返さない
+NEWS_ITEM_SELECTOR = CSSSelector('article.news-item, div.news-list-item, li.news-entry', translator='html') # より多くの可能性をカバー
+NEWS_TITLE_SELECTOR = CSSSelector('h2, h3, .news-title, .entry-title a', translator='html')
+NEWS_DATE_SELECTOR = CSSSelector('time, .news-date, .entry-date', translator='html')
+NEWS_LINK_SELECTOR = CSSSelector('a', translator='html') # 最も内側のaタグを取得しようと試みる
+
+# 日付らしき文字列を抽出する正規表現。書式ごとの分岐を1つの正規表現にまとめ、テキストを1回の走査で調べる
+#   ymd: "2024年5月15日", "2024年 5月 15日", "2024/05/15", "2024. 05. 15", "2024-05-15T10:00:00"
+#   en:  "May 15, 2024", "Sep. 1 2024"
+DATE_RE = re.compile(
+    r'(?P<ymd>(?P<ymd_year>\d{4})[年./-]\s*(?P<ymd_month>\d{1,2})[月./-]\s*(?P<ymd_day>\d{1,2})日?)'
+    r'|(?P<en>(?P<en_month>[A-Za-z]{3,})\.?\s+(?P<en_day>\d{1,2}),?\s+(?P<en_year>\d{4}))'
+)
+# 小文字の月名・略称 → 月の番号 (項目ごとに strptime や calendar を使わないよう、インポート時に1度だけ作る)
+_MONTH_NUM = (
+    {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+    | {abbr.lower(): i for i, abbr in enumerate(calendar.month_abbr) if abbr}
+    | {'sept': 9}
+)
+
+# 抽出した項目ごとのログの書式。呼び出し側で重複として除いた項目の行を見分けるのにも使う
+_FOUND_MSG = "  Found: %s (%s)"
+
+# Content-Type ヘッダーの charset 指定 (例: "text/html; charset=Shift_JIS")
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# 要素配下のテキストノード。get_text() と同じく <script>/<style> の中身 (とコメント) は含めない
+_TEXT_XPATH = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+
+def _text(element):
+    """要素配下のテキストを、各テキストノードを strip して連結した文字列で返します (get_text(strip=True) 相当)。"""
+    return ''.join(s.strip() for s in _TEXT_XPATH(element))
+
+def _handle_ymd(match):
+    return int(match['ymd_year']), int(match['ymd_month']), int(match['ymd_day'])
+
+def _handle_en_month(match):
+    month = _MONTH_NUM.get(match['en_month'].lower())
+    if month is None:
+        return None
+    return int(match['en_year']), month, int(match['en_day'])
+
+# DATE_RE のどの分岐に一致したか (match.lastgroup) → (年, 月, 日) を取り出す関数
+_DATE_HANDLERS = {
+    'ymd': _handle_ymd,
+    'en': _handle_en_month,
+}
+
+def _parse_ymd(date_text):
+    """
+    日付文字列から (年, 月, 日) の整数のタプルを取り出します。見つからない場合は None を返します。
+
+    date オブジェクトは作らないため、日付として正しいか (例: 13月) は呼び出し側で確認します。
+    """
+    for match in DATE_RE.finditer(date_text):
+        ymd = _DATE_HANDLERS[match.lastgroup](match)
+        if ymd is not None:
+            return ymd
+        # 月名ではない英単語だった場合は、その後ろを探す
+    return None
+
+def _charset_from_headers(headers):
+    """Content-Type ヘッダーで宣言された文字コードを返します。宣言がない場合は None を返します。"""
+    match = _CHARSET_RE.search(headers.get('Content-Type', ''))
+    return match.group(1) if match else None
+
+def _parse_html(html_bytes, charset=None):
+    """
+    HTMLのバイト列を lxml.html のツリーに変換します。
+
+    文字コードは HTTP ヘッダーの charset、<meta charset> などの宣言の順に調べ、見つかればバイト列のまま
+    lxml に解析させます。どちらの宣言もない場合に限り、<meta> のない日本語ページを latin-1 として
+    読んでしまわないよう、bs4 の UnicodeDammit で内容から推定して UTF-8 に変換してから解析します。
+    """
+    declared = charset or EncodingDetector.find_declared_encoding(html_bytes, is_html=True)
+    if declared:
+        try:
+            parser = lxml.html.HTMLParser(encoding=declared)
+            return lxml.html.document_fromstring(html_bytes, parser=parser)
+        except LookupError:
+            pass # lxml (libxml2) が扱えない文字コードは、推定と同じ方法で変換する
+    dammit = UnicodeDammit(html_bytes, [declared] if declared else [], is_html=True)
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    return lxml.html.document_fromstring(dammit.unicode_markup.encode('utf-8'), parser=parser)
+
+class PageTooLargeError(Exception):
+    """ページが MAX_BYTES を超えたため取得を打ち切ったことを表します。"""
+
+def _read_capped(response):
+    """
+    レスポンスの本文を MAX_BYTES まで読み込み、上限以内であれば True を返します。
+
+    CachedSession の filter_fn として、本文がキャッシュに保存される前に呼ばれます。
+    Content-Length または展開後に読み込んだ量が MAX_BYTES を超えた時点で接続を閉じて
+    PageTooLargeError を送出するため、大きすぎるページは最後までダウンロードされず、キャッシュにも残りません。
+    200 以外のレスポンスはキャッシュされないため、読み込まずに True を返します。
+    """
+    if response.status_code != 200:
+        return True
+    if not response._content_consumed:
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > MAX_BYTES:
+            response.close()
+            raise PageTooLargeError(f"Content-Length {content_length} exceeds {MAX_BYTES} bytes")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > MAX_BYTES:
+                response.close()
+                raise PageTooLargeError(f"Body exceeds {MAX_BYTES} bytes")
+            chunks.append(chunk)
+        # requests が response.content を読み込んだ後と同じ状態にする
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+    return len(response.content) <= MAX_BYTES
+
+def _create_session():
+    """
+    全スレッドで共有する requests.Session を作成します。
+
+    Keep-Alive で接続を使い回し、レート制限 (429) や一時的なサーバーエラー (500/502/503/504) は少し待って再試行します。
+    取得したページは news_http_cache.sqlite に保存し、次回以降は ETag / Last-Modified による
+    条件付きGETで再検証するため、更新のないページは 304 の短いレスポンスで済みます。
+    """
+    # expire_after=EXPIRE_IMMEDIATELY: 古い内容をそのまま返さず、毎回必ずサーバーに再検証する
+    # filter_fn=_read_capped: 本文は上限付きで読み込み、MAX_BYTES を超えるページはキャッシュしない
+    session = CachedSession(
+        HTTP_CACHE_NAME, backend='sqlite', cache_control=True, expire_after=EXPIRE_IMMEDIATELY, filter_fn=_read_capped
+    )
+    session.headers.update(HEADERS)
+    # raise_on_status=False: 再試行しきった場合も最後のレスポンスを返し、raise_for_status() で HTTPError として扱う
+    # respect_retry_after_header=False: Retry-After (既定では最大6時間) の待機で取得スレッドが止まらないよう、
+    # 429/503 でも backoff_factor による短い待機だけで再試行する (timeout はこの待機には効かない)
+    retry = Retry(
+        total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False, respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _fetch(session, url):
+    """
+    ニュースリリースページを取得し、(レスポンスボディのバイト列, ヘッダーで宣言された文字コード) を返します。
+    ワーカースレッドで実行されます。
+
+    本文の読み込みは _read_capped() が行い、MAX_BYTES を超えるページは PageTooLargeError になります。
+    (brotli がインストールされていれば、requests が自動で br 圧縮を受け入れます)
+    """
+    # stream=True: 本文は requests ではなく _read_capped() が上限付きで読み込む
+    # Increased timeout and disabled SSL verification for problematic sites
+    with session.get(url, timeout=15, verify=False, stream=True) as response:
+        response.raise_for_status()  # HTTPエラーがあれば例外を発生させる
+        if not _read_capped(response):
+            raise PageTooLargeError(f"Cached body exceeds {MAX_BYTES} bytes")
+        return response.content, _charset_from_headers(response.headers)
+
+def extract_news(company_name, base_url, html_bytes, date_limit_ord, charset=None):
+    """
+    取得したHTMLから、指定日以降に公開されたニュースリリースを抽出します。
+
+    プロセスプールで実行するため、引数と戻り値は pickle 可能な値のみとしています。
+
+    Args:
+        company_name (str): 会社名。
+        base_url (str): ニュースリリースページのURL。相対URLの変換に使用します。
+        html_bytes (bytes): ニュースリリースページのHTML。
+        date_limit_ord (int): 対象とする最も古い日付の序数 (date.toordinal())。
+        charset (str, optional): HTTP ヘッダーで宣言された文字コード。
+
+    Returns:
+        tuple: (ニュースリリースの辞書のリスト, ログメッセージのリスト)。
+            ログメッセージは (ログレベル, 書式, 引数のタプル) の形式で、書式の展開は
+            呼び出し側の logger.log() がそのレベルが有効な場合にだけ行います。
+    """
+    news = []
+    messages = []
+    if not html_bytes.strip():
+        return news, messages # 本文が空のページは、ニュースが0件だったものとして扱う
+    tree = _parse_html(html_bytes, charset)
+
+    # --- ここから各社サイトのHTML構造に合わせたニュース抽出ロジック ---
+    # この部分は汎用的に書くのが非常に難しいため、
+    # 各サイトの構造を個別に解析してセレクタを調整する必要があります。
+    # 以下はいくつかの仮のセレクタの例です。実際のサイトに合わせて変更してください。
+
+    # 例1: ニュースが <article> タグで囲まれ、日付が <time> タグにある場合
+    news_items = NEWS_ITEM_SELECTOR(tree)
+    base = urlsplit(base_url)
+    base_prefix = f"{base.scheme}://{base.netloc}"
+    # 同じURLは1度だけ扱い、トップページへのリンクはニュースとみなさない
+    seen_urls = {base_prefix, base_prefix + '/'}
+    _urljoin = urljoin # 項目ループ内ではローカル変数として参照する
+    # 日付の下限は (年, 月, 日) のタプルとして比較する
+    limit = date.fromordinal(date_limit_ord)
+    limit_ymd = (limit.year, limit.month, limit.day)
+
+    for item in news_items:
+        title_tags = NEWS_TITLE_SELECTOR(item)
+        date_tags = NEWS_DATE_SELECTOR(item)
+        link_tags = NEWS_LINK_SELECTOR(item)
+
+        if title_tags and date_tags and link_tags:
+            title_tag, date_tag, link_tag = title_tags[0], date_tags[0], link_tags[0]
+            news_url = (link_tag.get('href') or '').strip()
+            if not news_url:
+                # href のないリンクは重複扱いにせず、記録して読み飛ばす
+                messages.append((logging.DEBUG, "  No link URL: %s", (_text(title_tag),)))
+                continue
+            if not news_url.startswith('http'):
+                # 相対URLを絶対URLに変換 (多い "/path" 形式は urljoin を使わず連結する)
+                if news_url.startswith('/') and not news_url.startswith('//'):
+                    news_url = base_prefix + news_url
+                else:
+                    news_url = _urljoin(base_url, news_url)
+            if news_url in seen_urls:
+                continue
+            seen_urls.add(news_url)
+
+            date_text = _text(date_tag)
+            # 日付のパース処理 (様々な形式に対応できるようにする)
+            # 例: "2024年5月15日", "2024/05/15", "2024.05.15", "May 15, 2024"
+            ymd = _parse_ymd(date_text)
+            if ymd is None:
+                messages.append((logging.DEBUG, "  Could not parse date: %s", (date_text,)))
+                continue
+            if ymd < limit_ymd:
+                continue # 大半を占める古い項目は、整数のタプル比較だけで date を作らずに除外する
+            try:
+                news_date = date(*ymd)
+            except ValueError:
+                messages.append((logging.DEBUG, "  Could not parse date: %s", (date_text,)))
+                continue
+            # タイトルのテキストは対象期間内の項目についてだけ取り出す
+            news_title = _text(title_tag)
+            messages.append((logging.INFO, _FOUND_MSG, (news_title, news_date)))
+            news.append({
+                'company': company_name,
+                'title': news_title,
+                'url': news_url
+            })
+    return news, messages
+
+def _fetch_and_extract(session, parser_pool, company_name, url, date_limit_ord):
+    """ページを取得し、解析をプロセスプールに渡して結果を待ちます。ワーカースレッドで実行されます。"""
+    content, charset = _fetch(session, url)
+    return parser_pool.submit(extract_news, company_name, url, content, date_limit_ord, charset).result()
+
+class _NewsCsvWriter:
+    """
+    ニュースリリースを見つかった順にCSVファイルへ書き出します。
+
+    最初の1件を書き込むまでファイルは作成しません。output_filename が None の場合は何もしません。
+    """
+
+    def __init__(self, output_filename):
+        self.output_filename = output_filename
+        self._file = None
+        self._writer = None
+
+    def writerows(self, news_list):
+        if self.output_filename is None or not news_list:
+            return
+        if self._writer is None:
+            self._file = open(self.output_filename, 'w', newline='', encoding='utf-8-sig')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(CSV_HEADER)
+        self._writer.writerows((news['company'], news['title'], news['url']) for news in news_list)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def get_news_releases(companies_csv_path, days_within=7, output_filename=None):
     """
     CSVファイルから企業のリストを読み込み、指定された日数以内に公開されたニュースリリースを取得します。
 
     Args:
         companies_csv_path (str): 企業名とニュースリリースページのURLを含むCSVファイルのパス。
         days_within (int): ニュースリリースを検索する過去の日数。
+        output_filename (str, optional): 指定した場合、見つかったニュースリリースを随時このCSVファイルに書き出します。
+            1件も見つからなかった場合、ファイルは作成されません。
 
     Returns:
         list: 該当するニュースリリースのリスト。各要素は辞書で、
               {'company': '会社名', 'title': 'ニュースタイトル', 'url': 'ニュースURL'} の形式。
     """
     found_news = []
+    seen = set() # 出力済みの (会社名, URL)
     today = datetime.now()
     date_limit = today - timedelta(days=days_within)
+    # 日付の比較は序数(整数)で行う。ニュースの日付は 00:00 とみなし、date_limit 以降となる最初の日を下限とする
+    first_day = date_limit.date() if date_limit.time() == datetime.min.time() else date_limit.date() + timedelta(days=1)
+    date_limit_ord = first_day.toordinal()
 
     with open(companies_csv_path, 'r', encoding='utf-8-sig') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            company_name = row['company']
-            news_page_url = row['url']
+        reader = csv.reader(csvfile)
+        header = next(reader)
+        company_index, url_index = header.index('company'), header.index('url')
+        companies = [(row[company_index], row[url_index]) for row in reader if row]
 
-            print(f"Checking {company_name} at {news_page_url}...")
+    session = _create_session()
 
-            skipped_sites_log = "skipped_sites.log" # Log file for skipped sites
-            try:
-                # Add headers to mimic a browser visit, also disable SSL verification for problematic sites
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                response = requests.get(news_page_url, timeout=15, headers=headers, verify=False) # Increased timeout and added verify=False
-                response.raise_for_status()  # HTTPエラーがあれば例外を発生させる
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # --- ここから各社サイトのHTML構造に合わせたニュース抽出ロジック ---
-                # この部分は汎用的に書くのが非常に難しいため、
-                # 各サイトの構造を個別に解析してセレクタを調整する必要があります。
-                # 以下はいくつかの仮のセレクタの例です。実際のサイトに合わせて変更してください。
-
-                # 例1: ニュースが <article> タグで囲まれ、日付が <time> タグにある場合
-                news_items = soup.select('article.news-item, div.news-list-item, li.news-entry') # より多くの可能性をカバー
-
-                for item in news_items:
-                    title_tag = item.select_one('h2, h3, .news-title, .entry-title a')
-                    date_tag = item.select_one('time, .news-date, .entry-date')
-                    link_tag = item.select_one('a') # 最も内側のaタグを取得しようと試みる
-
-                    if title_tag and date_tag and link_tag:
-                        news_title = title_tag.get_text(strip=True)
-                        news_url = link_tag.get('href')
-                        if news_url and not news_url.startswith('http'):
-                            # 相対URLを絶対URLに変換
-                            from urllib.parse import urljoin
-                            news_url = urljoin(news_page_url, news_url)
-
-                        date_text = date_tag.get_text(strip=True)
-                        # 日付のパース処理 (様々な形式に対応できるようにする)
-                        # 例: "2024年5月15日", "2024/05/15", "2024.05.15", "May 15, 2024"
-                        # 正規表現で日付らしき文字列を抽出
-                        match = re.search(r'(\d{4})[年./-](\d{1,2})[月./-](\d{1,2})日?', date_text)
-                        if match:
-                            year, month, day = map(int, match.groups())
-                            try:
-                                news_date = datetime(year, month, day)
-                                if news_date >= date_limit:
-                                    print(f"  Found: {news_title} ({news_date.strftime('%Y-%m-%d')})")
-                                    found_news.append({
-                                        'company': company_name,
-                                        'title': news_title,
-                                        'url': news_url
-                                    })
-                            except ValueError:
-                                print(f"  Could not parse date: {date_text}")
-                        else:
-                            # 日付が見つからない場合、タイトルやURLに日付が含まれているかチェック (簡易的)
-                            if any(str(d) in news_title or str(d) in news_url for d in range(date_limit.day, today.day + 1)) and \
-                               any(str(m) in news_title or str(m) in news_url for m in [date_limit.month, today.month]) and \
-                               str(today.year) in (news_title or news_url): # 年は今年のみを想定
-                                print(f"  Found (date inferred): {news_title}")
-                                found_news.append({
-                                    'company': company_name,
-                                    'title': news_title,
-                                    'url': news_url
-                                })
+    skipped_sites_log = "skipped_sites.log" # Log file for skipped sites
+    # 取得(ネットワーク待ち)はスレッドで、HTML解析はGILの影響を受けないようプロセスで並列化し、
+    # 結果の記録はこのスレッドで順に行う
+    # 解析プロセスはワーカースレッドから起動されるため、ロックを握ったスレッドごと fork しないよう spawn で起動する
+    # スキップログは実行中ずっと開いたままにする (行バッファリングなので1行ごとに書き出される)
+    with open(skipped_sites_log, 'a', encoding='utf-8', buffering=1) as log_f, \
+         shelve.open(NEGATIVE_CACHE_PATH) as negative_cache, \
+         _NewsCsvWriter(output_filename) as csv_writer, \
+         ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn')) as parser_pool, \
+         ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for company_name, news_page_url in companies:
+            # 最近 403/404/SSLエラーになったサイトはアクセスせずにスキップする
+            cached_failure = negative_cache.get(news_page_url)
+            if cached_failure and datetime.now() - cached_failure[1] < NEGATIVE_CACHE_TTL:
+                logger.warning("Skipping %s (%s) due to cached failure (%s) at %s.", company_name, news_page_url, cached_failure[0], cached_failure[1])
+                log_f.write(f"{datetime.now()}: Skipped (Cached {cached_failure[0]}) - {company_name} - {news_page_url}\n")
+                logger.info("-" * 20)
+                continue
+            futures[executor.submit(_fetch_and_extract, session, parser_pool, company_name, news_page_url, date_limit_ord)] = (company_name, news_page_url)
+        for future in as_completed(futures):
+            company_name, news_page_url = futures[future]
 
+            logger.info("Checking %s at %s...", company_name, news_page_url)
 
+            try:
+                news, messages = future.result()
+                # 同じ会社の複数ページに同じニュースが載っている場合に備え、(会社名, URL) で重複を除く
+                is_new = []
+                for n in news:
+                    key = (n['company'], n['url'])
+                    is_new.append(key not in seen)
+                    seen.add(key)
+                # "Found" 行は news と同じ順に1件ずつ記録されているので、除いた項目の行は出力しない
+                found_is_new = iter(is_new)
+                for level, msg, args in messages:
+                    if msg == _FOUND_MSG and not next(found_is_new):
+                        continue
+                    logger.log(level, msg, *args)
+                news = [n for n, new in zip(news, is_new) if new]
+                found_news.extend(news)
+                csv_writer.writerows(news)
+                negative_cache.pop(news_page_url, None)
             except requests.exceptions.HTTPError as e:
+                if e.response.status_code in (403, 404):
+                    negative_cache[news_page_url] = (e.response.status_code, datetime.now())
                 if e.response.status_code == 403:
-                    print(f"Skipping {company_name} ({news_page_url}) due to 403 Forbidden.")
-                    with open(skipped_sites_log, 'a', encoding='utf-8') as f_log:
-                        f_log.write(f"{datetime.now()}: Skipped (403 Forbidden) - {company_name} - {news_page_url}\n")
+                    logger.warning("Skipping %s (%s) due to 403 Forbidden.", company_name, news_page_url)
+                    log_f.write(f"{datetime.now()}: Skipped (403 Forbidden) - {company_name} - {news_page_url}\n")
                 else:
-                    print(f"HTTP Error for {company_name} ({news_page_url}): {e}")
-                    with open(skipped_sites_log, 'a', encoding='utf-8') as f_log:
-                        f_log.write(f"{datetime.now()}: Skipped (HTTP Error: {e.response.status_code}) - {company_name} - {news_page_url}\n")
+                    logger.warning("HTTP Error for %s (%s): %s", company_name, news_page_url, e)
+                    log_f.write(f"{datetime.now()}: Skipped (HTTP Error: {e.response.status_code}) - {company_name} - {news_page_url}\n")
             except requests.exceptions.SSLError as e:
-                print(f"Skipping {company_name} ({news_page_url}) due to SSL Error: {e}")
-                with open(skipped_sites_log, 'a', encoding='utf-8') as f_log:
-                    f_log.write(f"{datetime.now()}: Skipped (SSL Error) - {company_name} - {news_page_url}\n")
+                logger.warning("Skipping %s (%s) due to SSL Error: %s", company_name, news_page_url, e)
+                negative_cache[news_page_url] = ('SSL Error', datetime.now())
+                log_f.write(f"{datetime.now()}: Skipped (SSL Error) - {company_name} - {news_page_url}\n")
             except requests.exceptions.Timeout as e:
-                print(f"Skipping {company_name} ({news_page_url}) due to Timeout: {e}")
-                with open(skipped_sites_log, 'a', encoding='utf-8') as f_log:
-                    f_log.write(f"{datetime.now()}: Skipped (Timeout) - {company_name} - {news_page_url}\n")
+                logger.warning("Skipping %s (%s) due to Timeout: %s", company_name, news_page_url, e)
+                log_f.write(f"{datetime.now()}: Skipped (Timeout) - {company_name} - {news_page_url}\n")
+            except PageTooLargeError as e:
+                logger.warning("Skipping %s (%s) due to page size: %s", company_name, news_page_url, e)
+                log_f.write(f"{datetime.now()}: Skipped (Too Large) - {company_name} - {news_page_url}\n")
             except requests.exceptions.RequestException as e:
-                print(f"Error fetching {news_page_url}: {e}")
-                with open(skipped_sites_log, 'a', encoding='utf-8') as f_log:
-                    f_log.write(f"{datetime.now()}: Skipped (RequestException: {type(e).__name__}) - {company_name} - {news_page_url}\n")
+                logger.warning("Error fetching %s: %s", news_page_url, e)
+                log_f.write(f"{datetime.now()}: Skipped (RequestException: {type(e).__name__}) - {company_name} - {news_page_url}\n")
             except Exception as e:
-                print(f"Error processing {company_name} ({news_page_url}): {e}")
-                with open(skipped_sites_log, 'a', encoding='utf-8') as f_log:
-                    f_log.write(f"{datetime.now()}: Skipped (Other Exception: {type(e).__name__}) - {company_name} - {news_page_url} - {e}\n")
-            print("-" * 20)
+                logger.warning("Error processing %s (%s): %s", company_name, news_page_url, e)
+                log_f.write(f"{datetime.now()}: Skipped (Other Exception: {type(e).__name__}) - {company_name} - {news_page_url} - {e}\n")
+            logger.info("-" * 20)
     return found_news
 
 def save_to_csv(news_list, output_filename):
@@ -127,17 +422,16 @@ def save_to_csv(news_list, output_filename):
         output_filename (str): 出力するCSVファイル名。
     """
     if not news_list:
-        print("No news releases found to save.")
+        logger.info("No news releases found to save.")
         return
 
-    keys = news_list[0].keys()
-    with open(output_filename, 'w', newline='', encoding='utf-8-sig') as output_file:
-        dict_writer = csv.DictWriter(output_file, fieldnames=keys)
-        dict_writer.writeheader()
-        dict_writer.writerows(news_list)
-    print(f"News releases saved to {output_filename}")
+    with _NewsCsvWriter(output_filename) as csv_writer:
+        csv_writer.writerows(news_list)
+    logger.info("News releases saved to %s", output_filename)
 
 if __name__ == "__main__":
+    # 大量に実行する場合は level=logging.WARNING にすると、項目ごとの "Found" 行を出力しなくなる
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
     companies_file = "companies.csv"
     days = 7 # デフォルト7日間
 
@@ -159,10 +453,10 @@ if __name__ == "__main__":
     output_csv_filename = f"{past_date_str}-{today_str}.csv"
 
 
-    print(f"Checking for news within the last {days} days...")
-    recent_news = get_news_releases(companies_file, days)
+    logger.info("Checking for news within the last %d days...", days)
+    recent_news = get_news_releases(companies_file, days, output_csv_filename)
 
     if recent_news:
-        save_to_csv(recent_news, output_csv_filename)
+        logger.info("News releases saved to %s", output_csv_filename)
     else:
-        print("No recent news found for any company.")
+        logger.info("No recent news found for any company.")